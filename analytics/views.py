@@ -1,6 +1,6 @@
 from django.views.generic import TemplateView, ListView, DetailView
-from django.db.models import Sum, Count, Avg, Q, Max, F, ExpressionWrapper, fields
-from django.db.models.functions import TruncDay, TruncMonth
+from django.db.models import Sum, Count, Avg, Q, Max, F, ExpressionWrapper, fields, Case, When, Value
+from django.db.models.functions import Coalesce, TruncDay, TruncMonth
 from users.models import User
 from orders.models import Order, OrderItem
 from products.models import Product, Category
@@ -379,34 +379,25 @@ class InventoryAnalyticsView(TemplateView):
         context['out_of_stock_products'] = out_of_stock_items[:15]
         context['high_value_products'] = sorted(high_value_items, key=lambda x: x['stock_value'], reverse=True)[:10]
 
-        # Stock by category
-        context['stock_by_category'] = []
-        for category in Category.objects.all():
-            category_stock = 0
-            category_value = 0
-            product_count = category.products.filter(is_active=True).count()
-            
-            for product in category.products.filter(is_active=True):
-                if hasattr(product, 'inventory_reverse') and product.inventory_reverse:
-                    available = product.inventory_reverse.available_quantity
-                    category_stock += available
-                    if available > 0:
-                        category_value += available * product.base_price
-            
-            if category_stock > 0 or product_count > 0:
-                context['stock_by_category'].append({
-                    'name': category.name,
-                    'total_stock': category_stock,
-                    'total_value': category_value,
-                    'product_count': product_count
-                })
-        
-        # Sort by total stock
-        context['stock_by_category'] = sorted(
-            context['stock_by_category'], 
-            key=lambda x: x['total_stock'], 
-            reverse=True
+        # Stock by category, aggregated in one query
+        category_available = Case(
+            When(
+                products__inventory_reverse__quantity__gt=F('products__inventory_reverse__reserved_quantity'),
+                then=F('products__inventory_reverse__quantity') - F('products__inventory_reverse__reserved_quantity'),
+            ),
+            default=Value(0),
+            output_field=fields.IntegerField(),
         )
+        active_products = Q(products__is_active=True)
+        context['stock_by_category'] = Category.objects.annotate(
+            product_count=Count('products', filter=active_products),
+            total_stock=Coalesce(Sum(category_available, filter=active_products), 0),
+            total_value=Coalesce(
+                Sum(category_available * F('products__base_price'), filter=active_products,
+                    output_field=DecimalField(max_digits=14, decimal_places=2)),
+                Value(Decimal('0')), output_field=DecimalField(max_digits=14, decimal_places=2),
+            ),
+        ).filter(Q(total_stock__gt=0) | Q(product_count__gt=0)).order_by('-total_stock', 'name')
 
         # Best selling products
         context['best_selling_products'] = Product.objects.annotate(
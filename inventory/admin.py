@@ -3,7 +3,19 @@ from django.contrib import admin, messages
 from django.db import models
 from django.utils.html import format_html
 from django import forms
-from .models import Inventory, StockMovement, StockAlert
+from .models import (
+    Inventory, StockMovement, StockAlert,
+    STOCK_OUT, STOCK_LOW, STOCK_IN,
+)
+
+STOCK_STATUS_BADGES = {
+    state: format_html('<span style="color: white; background: {}; padding: 2px 6px; border-radius: 4px;">{}</span>', color, text)
+    for state, color, text in (
+        (STOCK_OUT, 'red', 'Out'),
+        (STOCK_LOW, 'orange', 'Low'),
+        (STOCK_IN, 'green', 'OK'),
+    )
+}
 
 
 # ----------------------------------------------------------------------
@@ -13,6 +25,7 @@ class StockMovementInline(admin.TabularInline):
     model = StockMovement
     extra = 1
     fields = ('movement_type', 'quantity', 'reference', 'note', 'created_by', 'created_at')
+    autocomplete_fields = ('created_by',)
     readonly_fields = ('previous_quantity', 'new_quantity', 'created_at')
 
 # ----------------------------------------------------------------------
@@ -30,9 +43,11 @@ class StockAlertInline(admin.TabularInline):
 @admin.register(Inventory)
 class InventoryAdmin(admin.ModelAdmin):
     list_display = ('product', 'quantity', 'reserved_quantity', 'available_quantity', 'stock_status', 'location', 'last_restocked')
-    list_filter = ('location', 'last_restocked', 'created_at', 'low_stock_threshold')
+    list_filter = ('stock_state', 'location', 'last_restocked', 'created_at', 'low_stock_threshold')
     search_fields = ('product__products_name', 'batch_number', 'location')
+    autocomplete_fields = ('product',)
     ordering = ('-last_updated',)
+    show_full_result_count = False
     inlines = [StockMovementInline, StockAlertInline]
     readonly_fields = ('available_quantity', 'created_at', 'last_updated')
 
@@ -51,17 +66,9 @@ class InventoryAdmin(admin.ModelAdmin):
 
     def stock_status(self, obj):
         """Colored status badge"""
-        if obj.is_stock_out:
-            color = 'red'
-            text = 'Out'
-        elif obj.is_low_stock:
-            color = 'orange'
-            text = 'Low'
-        else:
-            color = 'green'
-            text = 'OK'
-        return format_html('<span style="color: white; background: {}; padding: 2px 6px; border-radius: 4px;">{}</span>', color, text)
+        return STOCK_STATUS_BADGES[obj.stock_state]
     stock_status.short_description = 'Status'
+    stock_status.admin_order_field = 'stock_state'
 
     actions = ['restock_selected', 'reserve_selected']
 
@@ -82,6 +89,7 @@ class StockMovementAdmin(admin.ModelAdmin):
     list_display = ('inventory', 'movement_type', 'quantity', 'reference', 'created_by', 'created_at')
     list_filter = ('movement_type', 'created_at', 'created_by')
     search_fields = ('inventory__product__products_name', 'reference', 'note')
+    autocomplete_fields = ('inventory', 'created_by')
     readonly_fields = ('previous_quantity', 'new_quantity', 'created_at')
     date_hierarchy = 'created_at'
 
@@ -103,6 +111,7 @@ class StockAlertAdmin(admin.ModelAdmin):
     list_display = ('inventory', 'alert_type', 'status', 'created_at', 'resolved_at')
     list_filter = ('alert_type', 'status', 'created_at')
     search_fields = ('inventory__product__products_name', 'message')
+    autocomplete_fields = ('inventory', 'resolved_by')
     readonly_fields = ('created_at', 'resolved_at')
     actions = ['resolve_alerts', 'dismiss_alerts']
 
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.6 on 2026-10-17 13:18
+
+from django.db import migrations, models
+
+
+def backfill_stock_state(apps, schema_editor):
+    # 0 = out, 1 = low, 2 = in (see inventory.models.STOCK_STATE_CHOICES)
+    Inventory = apps.get_model('inventory', 'Inventory')
+    available = models.F('quantity') - models.F('reserved_quantity')
+    Inventory.objects.update(stock_state=models.Case(
+        models.When(quantity__lte=models.F('reserved_quantity'), then=models.Value(0)),
+        models.When(low_stock_threshold__gte=available, then=models.Value(1)),
+        default=models.Value(2),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0003_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='inventory',
+            name='stock_state',
+            field=models.PositiveSmallIntegerField(choices=[(0, 'Out of Stock'), (1, 'Low Stock'), (2, 'In Stock')], db_index=True, default=0, editable=False, help_text='Derived from quantities and threshold on every save'),
+        ),
+        migrations.RunPython(backfill_stock_state, migrations.RunPython.noop),
+    ]
@@ -6,6 +6,14 @@ from django.utils import timezone
 from django.core.exceptions import ValidationError
 from products.models import Product  
 
+# Stored on Inventory.stock_state; mirrors is_stock_out / is_low_stock
+STOCK_OUT, STOCK_LOW, STOCK_IN = range(3)
+STOCK_STATE_CHOICES = [
+    (STOCK_OUT, 'Out of Stock'),
+    (STOCK_LOW, 'Low Stock'),
+    (STOCK_IN, 'In Stock'),
+]
+
 class InventoryManager(models.Manager):
     def low_stock(self):
         """Return inventory items with low stock (excluding out-of-stock)"""
@@ -26,6 +34,16 @@ class InventoryManager(models.Manager):
         """Return inventory items by location"""
         return self.filter(location=location)
 
+    def stock_counts(self):
+        """Return low-stock and out-of-stock counts in a single query"""
+        return self.aggregate(
+            low_stock_count=models.Count('id', filter=models.Q(
+                quantity__gt=0,
+                quantity__lte=models.F('low_stock_threshold')
+            )),
+            out_of_stock_count=models.Count('id', filter=models.Q(quantity=0)),
+        )
+
 class Inventory(models.Model):
     product = models.OneToOneField(
         'products.Product',  # String
@@ -38,6 +56,10 @@ class Inventory(models.Model):
     batch_number = models.CharField(max_length=50, blank=True, null=True, help_text="Batch/Lot number for traceability")
     low_stock_threshold = models.PositiveIntegerField(default=5)
     reorder_quantity = models.PositiveIntegerField(default=10, help_text="Quantity to reorder when stock is low")
+    stock_state = models.PositiveSmallIntegerField(
+        choices=STOCK_STATE_CHOICES, default=STOCK_OUT, editable=False, db_index=True,
+        help_text="Derived from quantities and threshold on every save"
+    )
     
     # Tracking
     last_restocked = models.DateTimeField(blank=True, null=True)
@@ -58,6 +80,18 @@ class Inventory(models.Model):
     def __str__(self):
         return f"{self.product.products_name} - {self.available_quantity} available"
 
+    def save(self, *args, **kwargs):
+        if self.is_stock_out:
+            self.stock_state = STOCK_OUT
+        elif self.is_low_stock:
+            self.stock_state = STOCK_LOW
+        else:
+            self.stock_state = STOCK_IN
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'stock_state'}
+        super().save(*args, **kwargs)
+
     @property
     def available_quantity(self):
         """Get available quantity (total minus reserved)"""
@@ -241,8 +275,10 @@ class StockAlert(models.Model):
 @receiver(post_save, sender=Product)
 def create_inventory_for_product(sender, instance, created, **kwargs):
     """Automatically create inventory record when a new product is created"""
-    if created:
-        Inventory.objects.get_or_create(product=instance)
+    # A brand-new product cannot have an inventory yet, so skip get_or_create's
+    # lookup; fixture loads (raw) bring their own inventory rows
+    if created and not kwargs.get('raw'):
+        Inventory.objects.create(product=instance)
 
 @receiver(post_save, sender=StockMovement)
 def trigger_stock_alert(sender, instance, created, **kwargs):
@@ -34,8 +34,7 @@ class InventoryDashboard(StaffRequiredMixin, ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['low_stock_count'] = Inventory.objects.low_stock().count()
-        context['out_of_stock_count'] = Inventory.objects.out_of_stock().count()
+        context.update(Inventory.objects.stock_counts())
         context['recent_movements'] = StockMovement.objects.select_related('inventory__product').order_by('-created_at')[:5]
         context['active_alerts'] = StockAlert.objects.filter(status='active').count()
         return context
@@ -156,10 +155,9 @@ class StockAlertListView(StaffRequiredMixin, ListView):
         alert_ids = request.POST.getlist('alert_ids')
         alerts = StockAlert.objects.filter(id__in=alert_ids)
         if action == 'resolve':
-            for alert in alerts:
-                alert.resolve(user=request.user)
-            messages.success(request, f"{alerts.count()} alert(s) resolved.")
+            resolved = alerts.update(status='resolved', resolved_at=timezone.now(), resolved_by=request.user)
+            messages.success(request, f"{resolved} alert(s) resolved.")
         elif action == 'dismiss':
-            alerts.update(status='dismissed')
-            messages.success(request, f"{alerts.count()} alert(s) dismissed.")
+            dismissed = alerts.update(status='dismissed')
+            messages.success(request, f"{dismissed} alert(s) dismissed.")
         return redirect('inventory:alerts')
\ No newline at end of file
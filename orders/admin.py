@@ -1,6 +1,32 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import Order, OrderItem
+from .models import Order, OrderItem, ORDER_STATUS_CHOICES, PAYMENT_STATUS_CHOICES
+
+def status_badge(color, label):
+    return format_html('<span style="color: {}; font-weight: bold;">{}</span>', color, label)
+
+# Status values are fixed choices, so every badge is rendered once at import
+ORDER_STATUS_COLORS = {
+    'pending': 'orange',
+    'confirmed': 'green',
+    'processed': 'blue',
+    'hold': 'red',
+    'rejected': 'darkred'
+}
+ORDER_STATUS_BADGES = {
+    value: status_badge(ORDER_STATUS_COLORS.get(value, 'gray'), label)
+    for value, label in ORDER_STATUS_CHOICES
+}
+
+PAYMENT_STATUS_COLORS = {
+    'pending': 'orange',
+    'paid': 'green',
+    'failed': 'red'
+}
+PAYMENT_STATUS_BADGES = {
+    value: status_badge(PAYMENT_STATUS_COLORS.get(value, 'gray'), label)
+    for value, label in PAYMENT_STATUS_CHOICES
+}
 
 class OrderItemInline(admin.TabularInline):
     model = OrderItem
@@ -40,33 +66,11 @@ class OrderAdmin(admin.ModelAdmin):
     )
     
     def simple_status(self, obj):
-        color = {
-            'pending': 'orange',
-            'confirmed': 'green', 
-            'processed': 'blue',
-            'hold': 'red',
-            'rejected': 'darkred'
-        }.get(obj.order_status, 'gray')
-        
-        return format_html(
-            '<span style="color: {}; font-weight: bold;">{}</span>',
-            color,
-            obj.get_order_status_display()
-        )
+        return ORDER_STATUS_BADGES.get(obj.order_status) or status_badge('gray', obj.get_order_status_display())
     simple_status.short_description = 'Status'
     
     def simple_payment(self, obj):
-        color = {
-            'pending': 'orange',
-            'paid': 'green',
-            'failed': 'red'
-        }.get(obj.payment_status, 'gray')
-        
-        return format_html(
-            '<span style="color: {}; font-weight: bold;">{}</span>',
-            color,
-            obj.get_payment_status_display()
-        )
+        return PAYMENT_STATUS_BADGES.get(obj.payment_status) or status_badge('gray', obj.get_payment_status_display())
     simple_payment.short_description = 'Payment'
     
     def created_date(self, obj):
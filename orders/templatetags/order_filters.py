@@ -1,14 +1,17 @@
 from django import template
-from urllib.parse import urlencode, parse_qs
+from urllib.parse import urlencode, parse_qsl
 
 register = template.Library()
 
 @register.filter
 def remove_query_param(querystring, param):
-    query_dict = parse_qs(querystring)
-    query_dict.pop(param, None)
-    return urlencode(query_dict, doseq=True)
+    if not querystring:
+        return ''
+    return urlencode([
+        (key, value) for key, value in parse_qsl(querystring, keep_blank_values=True) if key != param
+    ])
 
 @register.filter
 def lookup(dictionary, key):
-    return dictionary.get(key)
\ No newline at end of file
+    get = getattr(dictionary, 'get', None)
+    return get(key) if get is not None else None
\ No newline at end of file
@@ -1,22 +1,96 @@
 # products/admin.py
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
 from django.utils.html import format_html
-from django.urls import path
+from django.utils.safestring import mark_safe
+from django.urls import path, reverse
 from django.http import HttpResponseRedirect
 from django.contrib import messages
 from django.shortcuts import render
+from django.db.models import Value
+from django.db.models.functions import Coalesce
+from store.models import Category, Brand
+from inventory.models import STOCK_OUT
 from .models import Product, ProductImage, Review
 
+QUICK_ACTIONS_HTML = '<a href="{}">✏️ Edit</a>'
+
+# Ratings are limited to 1-5, so every possible star badge is built once
+RATING_STARS = tuple(
+    mark_safe(f'<span style="color: #ffd700;">{"★" * i}{"☆" * (5 - i)}</span>')
+    for i in range(6)
+)
+
+# Indexed by the stock_state annotation (STOCK_OUT, STOCK_LOW, STOCK_IN)
+STOCK_STATUS_BADGES = (
+    mark_safe('<span style="color: red;">✗ Out of Stock</span>'),
+    mark_safe('<span style="color: orange;">⚠ Low Stock</span>'),
+    mark_safe('<span style="color: green;">✓ In Stock</span>'),
+)
+
+STAFF_ADD_MESSAGE = mark_safe(
+    '<div style="background: #d4edda; padding: 10px; border-radius: 5px; margin-bottom: 20px;">'
+    '<strong>👨‍💼 Staff Permissions:</strong> You can create and edit products. '
+    'Only administrators can delete products.'
+    '</div>'
+)
+STAFF_CHANGE_MESSAGE = mark_safe(
+    '<div style="background: #d4edda; padding: 10px; border-radius: 5px; margin-bottom: 20px;">'
+    '<strong>👨‍💼 Staff Permissions:</strong> You can edit this product. '
+    'Only administrators can delete products.'
+    '</div>'
+)
+
+PRODUCT_FIELDSETS = (
+    ('Basic Information', {
+        'fields': (
+            'staff_permission_message',
+            'user', 'products_name', 'slug', 'product_code', 
+            'short_description', 'description'
+        )
+    }),
+    ('Categorization & Pricing', {
+        'fields': (
+            'category', 'sub_category', 'brand',
+            'base_price', 'sale_price', 'cost_price'
+        )
+    }),
+    ('Product Variants', {
+        'fields': ('color', 'size', 'weight'),
+        'classes': ('collapse',)
+    }),
+    ('Inventory & Stock', {
+        'fields': ('stock_managed_by_inventory',),
+        'classes': ('collapse',)
+    }),
+    ('Images', {
+        'fields': ('products_image',),
+        'classes': ('collapse',)
+    }),
+    ('SEO & Status', {
+        'fields': (
+            'meta_title', 'meta_description', 'tags',
+            'is_active', 'is_featured', 'is_published'
+        ),
+        'classes': ('collapse',)
+    }),
+    ('Timestamps', {
+        'fields': ('created_at', 'updated_at'),
+        'classes': ('collapse',)
+    }),
+)
+
 class ProductImageInline(admin.TabularInline):
     model = ProductImage
     extra = 1
     fields = ['image', 'alt_text', 'is_primary', 'display_order']
-    
-    def get_queryset(self, request):
-        qs = super().get_queryset(request)
-        if hasattr(self, 'original') and self.original:
-            return qs.filter(product=self.original)
-        return qs
+
+class ProductChangeList(ChangeList):
+    def get_queryset(self, request, exclude_parameters=None):
+        # Fetch only the columns ProductAdmin.list_display renders
+        return super().get_queryset(request, exclude_parameters).only(
+            'products_name', 'product_code', 'category__name', 'base_price', 'is_active'
+        )
 
 class ProductAdmin(admin.ModelAdmin):
     list_display = [
@@ -32,47 +106,25 @@ class ProductAdmin(admin.ModelAdmin):
     search_fields = ['products_name', 'product_code']
     readonly_fields = ['product_code', 'slug', 'created_at', 'updated_at', 'staff_permission_message']
     list_editable = ['is_active']
+    list_select_related = ['category']
+    list_per_page = 25
+    list_max_show_all = 100
+    show_full_result_count = False
+    sortable_by = ['products_name', 'product_code', 'base_price_display', 'stock_status', 'is_active']
+    autocomplete_fields = ['user', 'category', 'sub_category', 'brand']
     inlines = [ProductImageInline]
     actions = ['activate_products', 'deactivate_products', 'feature_products', 'unfeature_products']
     
-    fieldsets = (
-        ('Basic Information', {
-            'fields': (
-                'staff_permission_message',
-                'user', 'products_name', 'slug', 'product_code', 
-                'short_description', 'description'
-            )
-        }),
-        ('Categorization & Pricing', {
-            'fields': (
-                'category', 'sub_category', 'brand',
-                'base_price', 'sale_price', 'cost_price'
-            )
-        }),
-        ('Product Variants', {
-            'fields': ('color', 'size', 'weight'),
-            'classes': ('collapse',)
-        }),
-        ('Inventory & Stock', {
-            'fields': ('stock_managed_by_inventory',),
-            'classes': ('collapse',)
-        }),
-        ('Images', {
-            'fields': ('products_image',),
-            'classes': ('collapse',)
-        }),
-        ('SEO & Status', {
-            'fields': (
-                'meta_title', 'meta_description', 'tags',
-                'is_active', 'is_featured', 'is_published'
-            ),
-            'classes': ('collapse',)
-        }),
-        ('Timestamps', {
-            'fields': ('created_at', 'updated_at'),
-            'classes': ('collapse',)
-        }),
-    )
+    fieldsets = PRODUCT_FIELDSETS
+    
+    def get_queryset(self, request):
+        # Products without an inventory row count as out of stock
+        return super().get_queryset(request).annotate(
+            stock_state=Coalesce('inventory_reverse__stock_state', Value(STOCK_OUT))
+        )
+    
+    def get_changelist(self, request, **kwargs):
+        return ProductChangeList
     
     def get_urls(self):
         urls = super().get_urls()
@@ -87,8 +139,6 @@ class ProductAdmin(admin.ModelAdmin):
     
     def quick_add_view(self, request):
         """Quick product creation with minimal fields"""
-        from store.models import Category, Brand
-        
         if request.method == 'POST':
             try:
                 # Create product with minimal data
@@ -97,6 +147,8 @@ class ProductAdmin(admin.ModelAdmin):
                     base_price=request.POST.get('base_price', 0),
                     category_id=request.POST.get('category'),
                     brand_id=request.POST.get('brand') or None,
+                    sale_price=request.POST.get('sale_price') or None,
+                    cost_price=request.POST.get('cost_price') or None,
                     short_description=request.POST.get('short_description', ''),
                     user=request.user,
                     is_active=request.POST.get('is_active') == 'on',
@@ -104,13 +156,6 @@ class ProductAdmin(admin.ModelAdmin):
                     is_published=request.POST.get('is_published') == 'on',
                 )
                 
-                # Set optional prices
-                if request.POST.get('sale_price'):
-                    product.sale_price = request.POST.get('sale_price')
-                if request.POST.get('cost_price'):
-                    product.cost_price = request.POST.get('cost_price')
-                product.save()
-                
                 messages.success(request, f'Product "{product.products_name}" created successfully!')
                 return HttpResponseRedirect(f'../{product.pk}/change/')
                 
@@ -118,8 +163,8 @@ class ProductAdmin(admin.ModelAdmin):
                 messages.error(request, f'Error creating product: {str(e)}')
         
         context = {
-            'categories': Category.objects.all(),
-            'brands': Brand.objects.all(),
+            'categories': Category.objects.order_by('name').values_list('id', 'name'),
+            'brands': Brand.objects.order_by('name').values_list('id', 'name'),
             'title': 'Quick Add Product',
             'opts': self.model._meta,
         }
@@ -128,33 +173,21 @@ class ProductAdmin(admin.ModelAdmin):
     def base_price_display(self, obj):
         return f"${obj.base_price}"
     base_price_display.short_description = 'Price'
+    base_price_display.admin_order_field = 'base_price'
     
     def stock_status(self, obj):
-        if obj.is_in_stock:
-            if obj.is_low_stock:
-                return format_html('<span style="color: orange;">⚠ Low Stock</span>')
-            return format_html('<span style="color: green;">✓ In Stock</span>')
-        return format_html('<span style="color: red;">✗ Out of Stock</span>')
+        return STOCK_STATUS_BADGES[obj.stock_state]
     stock_status.short_description = 'Stock'
+    stock_status.admin_order_field = 'stock_state'
     
     def quick_actions(self, obj):
-        return format_html('<a href="{}">✏️ Edit</a>', f'{obj.id}/change/')
+        return format_html(QUICK_ACTIONS_HTML, reverse('admin:products_product_change', args=[obj.pk]))
     quick_actions.short_description = 'Actions'
     
     def staff_permission_message(self, obj=None):
         if not obj:
-            return format_html(
-                '<div style="background: #d4edda; padding: 10px; border-radius: 5px; margin-bottom: 20px;">'
-                '<strong>👨‍💼 Staff Permissions:</strong> You can create and edit products. '
-                'Only administrators can delete products.'
-                '</div>'
-            )
-        return format_html(
-            '<div style="background: #d4edda; padding: 10px; border-radius: 5px; margin-bottom: 20px;">'
-            '<strong>👨‍💼 Staff Permissions:</strong> You can edit this product. '
-            'Only administrators can delete products.'
-            '</div>'
-        )
+            return STAFF_ADD_MESSAGE
+        return STAFF_CHANGE_MESSAGE
     staff_permission_message.short_description = ''
     
     # Custom actions
@@ -183,6 +216,9 @@ admin.site.register(Product, ProductAdmin)
 @admin.register(ProductImage)
 class ProductImageAdmin(admin.ModelAdmin):
     list_display = ['product', 'image_tag', 'is_primary']
+    list_select_related = ['product']
+    search_fields = ['alt_text', 'product__products_name']
+    autocomplete_fields = ['product']
     
     def image_tag(self, obj):
         if obj.image:
@@ -192,6 +228,17 @@ class ProductImageAdmin(admin.ModelAdmin):
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
-    list_display = ['product', 'user', 'rating', 'is_approved', 'created_at']
+    list_display = ['product', 'user', 'rating_stars', 'is_approved', 'created_at']
     list_editable = ['is_approved']
-    list_filter = ['is_approved', 'rating']
\ No newline at end of file
+    list_filter = ['is_approved', 'rating']
+    list_select_related = ['product', 'user']
+    show_full_result_count = False
+    raw_id_fields = ['product', 'user']
+    
+    def rating_stars(self, obj):
+        # add_review stores the posted rating unchecked; show anything outside 0-5 as-is
+        if 0 <= obj.rating < len(RATING_STARS):
+            return RATING_STARS[obj.rating]
+        return obj.rating
+    rating_stars.short_description = 'Rating'
+    rating_stars.admin_order_field = 'rating'
@@ -9,7 +9,7 @@ class ProductForm(forms.ModelForm):
         fields = [
             'products_name', 'slug', 'product_code', 'brand', 'category', 'sub_category',
             'short_description', 'description', 'base_price', 'sale_price',
-            'cost_price', 'color', 'size', 'weight', 'products_image', 'gallery_images',
+            'cost_price', 'color', 'size', 'weight', 'products_image',
             'meta_title', 'meta_description', 'is_active', 'is_featured', 'is_published', 
             'user', 'stock_managed_by_inventory'
         ]
\ No newline at end of file
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-17 13:19
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='product',
+            name='gallery_images',
+        ),
+    ]
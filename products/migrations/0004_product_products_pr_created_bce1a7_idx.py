@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-17 13:43
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0004_inventory_stock_state'),
+        ('products', '0003_remove_product_gallery_images'),
+        ('store', '0003_remove_category_parent'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='product',
+            index=models.Index(fields=['-created_at'], name='products_pr_created_bce1a7_idx'),
+        ),
+    ]
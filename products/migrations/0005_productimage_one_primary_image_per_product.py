@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-17 13:21
+
+from django.db import migrations, models
+
+
+def demote_extra_primaries(apps, schema_editor):
+    # Keep the newest primary image per product, as ProductImage.save() would have
+    ProductImage = apps.get_model('products', 'ProductImage')
+    newest = ProductImage.objects.filter(
+        product_id=models.OuterRef('product_id'), is_primary=True
+    ).order_by('-id').values('id')[:1]
+    ProductImage.objects.filter(is_primary=True).exclude(
+        id=models.Subquery(newest)
+    ).update(is_primary=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0004_product_products_pr_created_bce1a7_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(demote_extra_primaries, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='productimage',
+            constraint=models.UniqueConstraint(condition=models.Q(('is_primary', True)), fields=('product',), name='one_primary_image_per_product'),
+        ),
+    ]
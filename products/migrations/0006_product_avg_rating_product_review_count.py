@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-17 13:28
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def backfill_review_stats(apps, schema_editor):
+    Product = apps.get_model('products', 'Product')
+    Review = apps.get_model('products', 'Review')
+    approved = Review.objects.filter(product_id=models.OuterRef('pk'), is_approved=True).values('product_id')
+    Product.objects.update(
+        avg_rating=models.Subquery(approved.annotate(avg=models.Avg('rating')).values('avg')),
+        review_count=Coalesce(
+            models.Subquery(approved.annotate(count=models.Count('id')).values('count')), 0
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0005_productimage_one_primary_image_per_product'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='product',
+            name='avg_rating',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=3, null=True),
+        ),
+        migrations.AddField(
+            model_name='product',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_review_stats, migrations.RunPython.noop),
+    ]
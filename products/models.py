@@ -1,9 +1,10 @@
 # products/models.py
 
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django_ckeditor_5.fields import CKEditor5Field
 from django.utils.text import slugify
-from django.db.models import Max
 import re
 import uuid
 from store.models import Category, Brand
@@ -11,6 +12,7 @@ from users.models import User
 from django.contrib.auth import get_user_model
 from decimal import Decimal
 from django.urls import reverse
+from django.utils.functional import cached_property
 
 COLOR_CHOICES = [
     ('Red', 'Red'), ('Blue', 'Blue'), ('Pink', 'Pink'), ('Orange', 'Orange'),
@@ -24,25 +26,36 @@ SIZE_CHOICES = [
 ]
 
 class ProductManager(models.Manager):
+    # These filter on Inventory.stock_state (indexed, kept current by
+    # Inventory.save()) through inventory_reverse, the relation that is
+    # actually populated. Imports are local: inventory.models imports this module.
+
     def in_stock(self):
         """Return products that are in stock"""
-        return self.filter(is_active=True, inventory__quantity__gt=0)
+        from inventory.models import STOCK_LOW, STOCK_IN
+        return self.filter(is_active=True, inventory_reverse__stock_state__in=[STOCK_LOW, STOCK_IN])
     
     def low_stock(self):
         """Return products with low stock"""
-        return self.filter(
-            is_active=True,
-            inventory__quantity__lte=models.F('inventory__low_stock_threshold'),
-            inventory__quantity__gt=0
-        )
+        from inventory.models import STOCK_LOW
+        return self.filter(is_active=True, inventory_reverse__stock_state=STOCK_LOW)
     
     def out_of_stock(self):
-        """Return out of stock products"""
+        """Return out of stock products (including those without an inventory row)"""
+        from inventory.models import STOCK_OUT
         return self.filter(
+            models.Q(inventory_reverse__stock_state=STOCK_OUT) | models.Q(inventory_reverse__isnull=True),
             is_active=True,
-            inventory__quantity=0
         )
 
+    def with_current_price(self):
+        """Annotate current_price_db, the current_price rule as a DB expression"""
+        return self.annotate(current_price_db=models.Case(
+            models.When(sale_price__lt=models.F('base_price'), then=models.F('sale_price')),
+            default=models.F('base_price'),
+            output_field=models.DecimalField(max_digits=10, decimal_places=2),
+        ))
+
 class Product(models.Model):
     # Basic Information
     inventory = models.OneToOneField(
@@ -80,7 +93,6 @@ class Product(models.Model):
 
     # Images
     products_image = models.ImageField(upload_to='products/images/', blank=True, null=True)
-    gallery_images = models.ManyToManyField('ProductImage', blank=True,related_name='product_gallery',)
 
     # SEO
     meta_title = models.CharField(max_length=255, blank=True, null=True)
@@ -91,6 +103,10 @@ class Product(models.Model):
     is_active = models.BooleanField(default=True)
     is_featured = models.BooleanField(default=False)
     is_published = models.BooleanField(default=True)
+
+    # Review stats, kept in sync with approved reviews by the Review signals below
+    avg_rating = models.DecimalField(max_digits=3, decimal_places=2, blank=True, null=True, editable=False)
+    review_count = models.PositiveIntegerField(default=0, editable=False)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -98,6 +114,9 @@ class Product(models.Model):
 
     objects = ProductManager()
 
+    # cached_property attributes that save() must invalidate
+    CACHED_PROPERTIES = ('current_price', 'profit_margin', 'is_in_stock', 'available_quantity', 'is_low_stock')
+
     class Meta:
         ordering = ['-created_at']
         indexes = [
@@ -105,48 +124,59 @@ class Product(models.Model):
             models.Index(fields=['base_price']),
             models.Index(fields=['category']),
             models.Index(fields=['brand']),
+            models.Index(fields=['-created_at']),
         ]
 
     def save(self, *args, **kwargs):
-        if not self.slug:
+        # With update_fields, only fill in the fields being written; this also
+        # avoids loading deferred columns on partially fetched instances
+        update_fields = kwargs.get('update_fields')
+
+        def writing(field):
+            return update_fields is None or field in update_fields
+
+        if writing('slug') and not self.slug:
             self.slug = slugify(self.products_name)
 
-        if not self.product_code:
-            prefix = 'DK07'
-            last_id = Product.objects.aggregate(last_id=Max('id'))['last_id'] or 0
-            counter = last_id + 1
-            uuid_segment = str(uuid.uuid4())[:4].upper()
-            self.product_code = f"{prefix}{counter:05d}-{uuid_segment}"
-            while Product.objects.filter(product_code=self.product_code).exists():
-                counter += 1
-                self.product_code = f"{prefix}{counter:05d}-{uuid_segment}"
+        if writing('product_code') and not self.product_code:
+            # Random suffix: unique by construction, no lookups on insert
+            self.product_code = f"DK07-{uuid.uuid4().hex[:10].upper()}"
 
         # Set sale price if not provided
-        if self.sale_price is None: # Use None check for proper initialization
+        if writing('sale_price') and self.sale_price is None: # Use None check for proper initialization
             self.sale_price = self.base_price
 
         super().save(*args, **kwargs)
 
+        # Drop values cached from the pre-save state, including the
+        # with_current_price() annotation that current_price prefers
+        for name in self.CACHED_PROPERTIES:
+            self.__dict__.pop(name, None)
+        self.__dict__.pop('current_price_db', None)
+
     def __str__(self):
         return f"{self.products_name} ({self.product_code})"
 
     def get_absolute_url(self):
         return reverse('products:product_detail', kwargs={'slug': self.slug})
     
-    @property
+    @cached_property
     def current_price(self):
         """
         Calculates the current selling price: 
         Uses sale_price if available and less than base_price, otherwise falls back to base_price.
+        Cached per instance; reuses current_price_db from with_current_price().
         """
+        if 'current_price_db' in self.__dict__:
+            return self.current_price_db
         if self.sale_price is not None and self.sale_price < self.base_price:
             return self.sale_price
         return self.base_price
 # products/models.py  (add this inside the Product class)
 
-    @property
+    @cached_property
     def profit_margin(self):
-        """Calculates profit margin based on current price and cost price."""
+        """Calculates profit margin based on current price and cost price (cached per instance)."""
         if self.cost_price is not None and self.base_price is not None:
             selling_price = self.current_price
             
@@ -157,28 +187,33 @@ class Product(models.Model):
         return None 
     
     @property
+    def inventory_or_none(self):
+        """The inventory_reverse row or None, in one descriptor access (select_related('inventory_reverse') makes it free)."""
+        return getattr(self, 'inventory_reverse', None)
+
+    @cached_property
     def is_in_stock(self):
-        """Check if product has positive quantity in inventory."""
-        # Use inventory_reverse (the correct related name)
-        if hasattr(self, 'inventory_reverse') and self.inventory_reverse is not None:
-            return self.inventory_reverse.available_quantity > 0 
-        return False
+        """Check if product has positive quantity in inventory (cached per instance)."""
+        inventory = self.inventory_or_none
+        return inventory is not None and inventory.available_quantity > 0
 
-    @property
+    @cached_property
     def available_quantity(self):
-        """Get the available quantity from inventory."""
-        # Use inventory_reverse (the correct related name)
-        if hasattr(self, 'inventory_reverse') and self.inventory_reverse is not None:
-            return self.inventory_reverse.available_quantity
-        return 0
+        """Get the available quantity from inventory (cached per instance)."""
+        inventory = self.inventory_or_none
+        return inventory.available_quantity if inventory is not None else 0
 
-    @property
+    @cached_property
     def is_low_stock(self):
-        """Check if product is at or below the low stock threshold."""
-        # Use inventory_reverse (the correct related name)
-        if hasattr(self, 'inventory_reverse') and self.inventory_reverse is not None:
-            return self.inventory_reverse.is_low_stock
-        return False
+        """Check if product is at or below the low stock threshold (cached per instance)."""
+        inventory = self.inventory_or_none
+        return inventory is not None and inventory.is_low_stock
+
+    @property
+    def primary_image(self):
+        """The primary ProductImage, else the first one; served from prefetch_related('images') when present."""
+        images = list(self.images.all())
+        return next((image for image in images if image.is_primary), images[0] if images else None)
 
     def get_price_for_order(self):
         """Get price to be used in orders (immutable once order is created)"""
@@ -193,13 +228,27 @@ class ProductImage(models.Model):
 
     class Meta:
         ordering = ['is_primary', 'display_order', '-id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['product'],
+                condition=models.Q(is_primary=True),
+                name='one_primary_image_per_product',
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         if self.is_primary:
-            # Ensure only one primary image per product
-            ProductImage.objects.filter(product=self.product, is_primary=True).update(is_primary=False)
+            # Demote the current primary; the constraint guarantees there is at most one
+            ProductImage.objects.filter(
+                product_id=self.product_id, is_primary=True
+            ).exclude(pk=self.pk).update(is_primary=False)
         super().save(*args, **kwargs)
 
+    def validate_constraints(self, exclude=None):
+        # save() demotes the previous primary, so picking a new one is not a form error
+        exclude = set(exclude or ()) | {'is_primary'}
+        super().validate_constraints(exclude=exclude)
+
     def __str__(self):
         return self.alt_text or f"Image for {self.product.products_name}"
 
@@ -221,3 +270,18 @@ class Review(models.Model):
         return f"Review by {self.user.username} for {self.product.products_name} - {self.rating} stars"
 
 
+# Signals
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def update_product_review_stats(sender, instance, **kwargs):
+    """Recompute the product's avg_rating/review_count from its approved reviews"""
+    if kwargs.get('raw'):
+        return
+    stats = Review.objects.filter(product_id=instance.product_id, is_approved=True).aggregate(
+        avg=models.Avg('rating'), count=models.Count('id')
+    )
+    avg = stats['avg']
+    if avg is not None:
+        # add_review stores the posted rating unchecked; keep avg_rating within 0-5
+        avg = min(max(avg, 0), 5)
+    Product.objects.filter(pk=instance.product_id).update(avg_rating=avg, review_count=stats['count'])
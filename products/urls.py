@@ -1,6 +1,4 @@
 from django.urls import path
-from django.conf import settings
-from django.conf.urls.static import static
 from . import views
 
 app_name = 'products'
@@ -15,7 +13,3 @@ urlpatterns = [
     path('search/suggest/', views.search_suggestions, name='search_suggestions'),
     path('add-review/', views.add_review, name='add_review'),
 ]
-
-# ✅ Serve media files in development
-if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
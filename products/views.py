@@ -6,16 +6,17 @@ from datetime import timedelta
 
 from django.shortcuts import render, get_object_or_404, redirect
 from django.http import JsonResponse
-from django.db.models import Q, Avg, Count, Exists, OuterRef
+from django.db.models import Q, Count, Exists, OuterRef, Prefetch, Subquery, Value, Case, When, IntegerField
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.cache import cache_page
 from django.contrib import messages
 from django.views.generic import ListView, DetailView
 from django.utils import timezone
 
-from .models import Product, Review, COLOR_CHOICES, SIZE_CHOICES
-from .utils import calculate_discount
-from store.models import Category, Brand
+from .models import Product, ProductImage, Review, COLOR_CHOICES, SIZE_CHOICES, WEIGHT_CHOICES
+from store.models import Category, nav_categories, nav_brands
 from orders.models import OrderItem
+from inventory.models import STOCK_OUT
 
 
 
@@ -42,6 +43,9 @@ def _get_user_order(request):
     return None
 
 
+# Long text columns the home page cards never render
+HOME_DEFERRED_FIELDS = ('description', 'short_description', 'meta_description')
+
 
 def home(request, category_slug=None, brand_slug=None):
     """
@@ -50,9 +54,16 @@ def home(request, category_slug=None, brand_slug=None):
     - Supports optional category or brand filtering by slug
     """
     
+    # In-stock first, then newest; stock_state is kept current by Inventory.save()
     products_qs = Product.objects.filter(is_active=True).select_related(
         'category', 'brand', 'inventory_reverse'
-    ).prefetch_related('images')
+    ).prefetch_related('images').defer(*HOME_DEFERRED_FIELDS).annotate(
+        out_of_stock_order=Case(
+            When(inventory_reverse__stock_state__gt=STOCK_OUT, then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+        )
+    ).order_by('out_of_stock_order', '-created_at')
     
     # Filter by category if slug provided
     if category_slug:
@@ -68,31 +79,28 @@ def home(request, category_slug=None, brand_slug=None):
         is_featured=True
     ).select_related(
         'category', 'brand', 'inventory_reverse'
-    ).prefetch_related('images')[:8]  # Limit to 8 featured products
+    ).prefetch_related('images').defer(*HOME_DEFERRED_FIELDS)[:8]  # Limit to 8 featured products
+
+    # The home grid is a preview; "View All" links to the paginated product list
+    products_qs = products_qs[:48]
 
     # Calculate discounts
     products = [calculate_discount(p) for p in products_qs]
     featured_products = [calculate_discount(p) for p in featured_products_qs]
 
-    # Sort: in-stock first, then newest
-    products = sorted(
-        products,
-        key=lambda p: (not p.is_in_stock, -p.created_at.timestamp())
-    )
-
     # Add color and size choices to main products
     for p in products:
-        p.color_choices = p._meta.get_field('color').choices if hasattr(p, 'color') and p.color else []
-        p.size_choices = p._meta.get_field('size').choices if hasattr(p, 'size') and p.size else []
+        p.color_choices = COLOR_CHOICES if p.color else []
+        p.size_choices = SIZE_CHOICES if p.size else []
 
     # Add color and size choices to featured products
     for p in featured_products:
-        p.color_choices = p._meta.get_field('color').choices if hasattr(p, 'color') and p.color else []
-        p.size_choices = p._meta.get_field('size').choices if hasattr(p, 'size') and p.size else []
+        p.color_choices = COLOR_CHOICES if p.color else []
+        p.size_choices = SIZE_CHOICES if p.size else []
 
     # Categories and brands for sidebar / navigation
-    categories = Category.objects.all()
-    brands = Brand.objects.all()
+    categories = nav_categories()
+    brands = nav_brands()
 
     # Cart handling
     if request.user.is_authenticated:
@@ -124,11 +132,9 @@ class ProductListView(ListView):
     paginate_by = 12
 
     def get_queryset(self):
-        queryset = Product.objects.filter(is_active=True).select_related(
+        queryset = Product.objects.with_current_price().filter(is_active=True).select_related(
             'category', 'brand', 'inventory_reverse'
-        ).prefetch_related('images', 'reviews')
-
-        queryset = queryset.annotate(avg_rating=Avg('reviews__rating'))
+        ).prefetch_related('images')
 
         # --- Filter logic ---
         category_slug = self.request.GET.get('category', '')
@@ -153,18 +159,18 @@ class ProductListView(ListView):
         if tag:
             queryset = queryset.filter(tags__icontains=tag)
         if min_price:
-            queryset = queryset.filter(sale_price__gte=Decimal(min_price))
+            queryset = queryset.filter(current_price_db__gte=Decimal(min_price))
         if max_price:
-            queryset = queryset.filter(sale_price__lte=Decimal(max_price))
+            queryset = queryset.filter(current_price_db__lte=Decimal(max_price))
 
         # Sorting
         sort = self.request.GET.get('sort', 'rating_desc')
         if sort == 'name_asc':
             queryset = queryset.order_by('products_name')
         elif sort == 'price_asc':
-            queryset = queryset.order_by('sale_price')
+            queryset = queryset.order_by('current_price_db')
         elif sort == 'price_desc':
-            queryset = queryset.order_by('-sale_price')
+            queryset = queryset.order_by('-current_price_db')
         elif sort == 'rating_desc':
             queryset = queryset.order_by('-avg_rating')
         elif sort == 'newest':
@@ -176,7 +182,13 @@ class ProductListView(ListView):
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['categories'] = Category.objects.all()
+        categories = nav_categories()
+        context['categories'] = categories
+        # Resolve the active category once instead of scanning the list in the template
+        category_slug = self.request.GET.get('category', '')
+        context['selected_category'] = next(
+            (category for category in categories if category.slug == category_slug), None
+        )
         
         # Process products to add necessary attributes
         products = context['products']
@@ -187,8 +199,8 @@ class ProductListView(ListView):
             product = calculate_discount(product)
             
             # Add color and size choices
-            product.color_choices = product._meta.get_field('color').choices if hasattr(product, 'color') and product.color else []
-            product.size_choices = product._meta.get_field('size').choices if hasattr(product, 'size') and product.size else []
+            product.color_choices = COLOR_CHOICES if product.color else []
+            product.size_choices = SIZE_CHOICES if product.size else []
             
             processed_products.append(product)
         
@@ -201,6 +213,23 @@ class ProductDetailView(DetailView):
     template_name = 'products/detail.html'
     context_object_name = 'product'
 
+    def get_queryset(self):
+        queryset = super().get_queryset().select_related('inventory_reverse')
+        user = self.request.user
+        if user.is_authenticated:
+            # Fold the purchase check and the user's review lookup into the product SELECT
+            queryset = queryset.annotate(
+                purchased=Exists(OrderItem.objects.filter(
+                    order__user=user,
+                    product=OuterRef('pk'),
+                    order__payment_status='Paid'
+                )),
+                user_review_id=Subquery(
+                    Review.objects.filter(product=OuterRef('pk'), user=user).values('id')[:1]
+                ),
+            )
+        return queryset
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         product = self.object
@@ -211,34 +240,26 @@ class ProductDetailView(DetailView):
         # Only approved reviews
         reviews = product.reviews.filter(is_approved=True)
         context['reviews'] = reviews
-        context['average_rating'] = reviews.aggregate(avg=Avg('rating'))['avg'] or 0
-        context['review_count'] = reviews.count()
+        context['average_rating'] = product.avg_rating or 0
+        context['review_count'] = product.review_count
 
         # Add color/size/weight choices for dropdowns
-        product.color_choices = product._meta.get_field('color').choices if product.color else []
-        product.size_choices = product._meta.get_field('size').choices if product.size else []
-        product.weight_choices = product._meta.get_field('weight').choices if product.weight else []
+        product.color_choices = COLOR_CHOICES if product.color else []
+        product.size_choices = SIZE_CHOICES if product.size else []
+        product.weight_choices = WEIGHT_CHOICES if product.weight else []
 
         # User review logic
         user = self.request.user
         can_review = False
         user_review = None
         if user.is_authenticated:
-            purchased = OrderItem.objects.filter(
-                order__user=user,
-                product=product,
-                order__payment_status='Paid'
-            ).exists()
-            existing_review = product.reviews.filter(user=user).first()
-            can_review = purchased and (existing_review is None)
-            user_review = existing_review
+            if product.user_review_id is not None:
+                user_review = Review.objects.get(pk=product.user_review_id)
+            can_review = product.purchased and (user_review is None)
 
         context['can_review'] = can_review
         context['user_review'] = user_review
 
-        # Tags
-        context['product'].tag_list = [t.strip() for t in (product.tags or "").split(",")]
-
         return context
 
 
@@ -301,7 +322,9 @@ def search(request):
     Search by product name or description.
     """
     query = request.GET.get('q', '').strip()
-    products_qs = Product.objects.filter(is_active=True).select_related('category', 'brand')
+    # Result cards preview short_description; the full description is only
+    # loaded for products that have no short one
+    products_qs = Product.objects.filter(is_active=True).select_related('category', 'brand').prefetch_related('images').defer('description')
 
     if query:
         products_qs = products_qs.filter(
@@ -313,15 +336,15 @@ def search(request):
         )
     else:
         # If no query, return some featured products or empty
-        products_qs = Product.objects.filter(is_active=True, is_featured=True)[:12]
+        products_qs = products_qs.filter(is_featured=True)[:12]
 
     # Regular search results
     products = [calculate_discount(p) for p in products_qs]
 
     # Add color and size choices for template
     for product in products:
-        product.color_choices = product._meta.get_field('color').choices if hasattr(product, 'color') and product.color else []
-        product.size_choices = product._meta.get_field('size').choices if hasattr(product, 'size') and product.size else []
+        product.color_choices = COLOR_CHOICES if product.color else []
+        product.size_choices = SIZE_CHOICES if product.size else []
         
         # Add main image for template display
         product.main_image_url = get_product_main_image(product)
@@ -336,8 +359,8 @@ def search(request):
 
     context = {
         'products': products,
-        'categories': Category.objects.all(),
-        'brands': Brand.objects.all(),
+        'categories': nav_categories(),
+        'brands': nav_brands(),
         'query': query,
         'order': order,
         'cart_items': cart_items,
@@ -351,9 +374,9 @@ def get_product_main_image(product):
     Get the main image URL for a product, handling different field structures
     """
     try:
-        # Method 1: Check images relation
-        if hasattr(product, 'images') and product.images.exists():
-            first_image = product.images.first()
+        # Method 1: Check images relation (prefetch-aware)
+        if hasattr(product, 'images'):
+            first_image = product.primary_image
             if first_image and hasattr(first_image, 'image') and first_image.image:
                 return first_image.image.url
         
@@ -373,6 +396,7 @@ def get_product_main_image(product):
 
 
 
+@cache_page(30)  # Same prefix -> same JSON for every visitor; absorbs keystroke bursts
 def search_suggestions(request):
     """
     AJAX view for search suggestions (returns JSON)
@@ -388,16 +412,21 @@ def search_suggestions(request):
             Q(category__name__icontains=query) |
             Q(brand__name__icontains=query),
             is_active=True
+        ).only(
+            # Only what the JSON payload needs; skips the CKEditor HTML columns
+            'products_name', 'slug', 'sale_price', 'base_price'
+        ).prefetch_related(
+            Prefetch('images', queryset=ProductImage.objects.only('product_id', 'image', 'is_primary'))
         )[:8]  # Limit to 8 suggestions
         
         for product in products:
             # Get the first image from the images relation or use default
             image_url = ''
             try:
-                if product.images.exists():
-                    # Get the first image from the related images
-                    first_image = product.images.first()
-                    if first_image and hasattr(first_image, 'image') and first_image.image:
+                first_image = product.primary_image
+                if first_image:
+                    # Use the primary (or first) image from the prefetched images
+                    if hasattr(first_image, 'image') and first_image.image:
                         image_url = first_image.image.url
                 else:
                     # Try other possible image fields
@@ -447,7 +476,7 @@ def calculate_discount(product):
         product.discount_percentage = 0
     
     # Stock info
-    product.stock_available = product.inventory_reverse.available_quantity if product.inventory_reverse else 0
+    product.stock_available = product.available_quantity
     product.is_out_of_stock = product.stock_available <= 0
     
     return product
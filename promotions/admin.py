@@ -7,7 +7,7 @@ class PromotionAdmin(admin.ModelAdmin):
     list_filter = ['promo_type', 'is_active', 'start_date', 'end_date']
     search_fields = ['name', 'code', 'description']
     date_hierarchy = 'start_date'
-    filter_horizontal = ['products']
+    autocomplete_fields = ['products']
     list_editable = ['is_active']
     readonly_fields = ['created_at', 'updated_at']
     fieldsets = (
@@ -1,6 +1,14 @@
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.core.cache import cache
 from django.utils.text import slugify
 
+# Category/Brand lists shown in storefront navigation change rarely; cache them
+NAV_CACHE_TIMEOUT = 600
+NAV_CATEGORIES_CACHE_KEY = 'store:nav_categories'
+NAV_BRANDS_CACHE_KEY = 'store:nav_brands'
+
 class Brand(models.Model):
     name = models.CharField(max_length=255)
     logo = models.ImageField(upload_to='brands/', blank=True, null=True)
@@ -47,3 +55,23 @@ class Category(models.Model):
 
     def __str__(self):
         return self.name
+
+
+def nav_categories():
+    """All categories, cached for storefront navigation"""
+    return cache.get_or_set(NAV_CATEGORIES_CACHE_KEY, lambda: list(Category.objects.all()), NAV_CACHE_TIMEOUT)
+
+
+def nav_brands():
+    """All brands, cached for storefront navigation"""
+    return cache.get_or_set(NAV_BRANDS_CACHE_KEY, lambda: list(Brand.objects.all()), NAV_CACHE_TIMEOUT)
+
+
+# Signals
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Brand)
+@receiver(post_delete, sender=Brand)
+def clear_nav_cache(sender, **kwargs):
+    """Drop the cached navigation lists when a category or brand changes"""
+    cache.delete_many([NAV_CATEGORIES_CACHE_KEY, NAV_BRANDS_CACHE_KEY])